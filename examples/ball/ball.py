@@ -6,63 +6,111 @@ Demonstrates smooth animation using double buffering and easing functions.
 The ball bounces with realistic acceleration and deceleration.
 
 Requirements:
-- Python 3.6+
+- Python 3.7+
 - math module (standard library)
 - socket module (standard library)
 - time module (standard library)
 """
 
 import math
+import os
 import socket
 import time
-from typing import Tuple
+from typing import List, Tuple
+
+FRAME_NS = 16_666_667  # 60 FPS
+
+def _expects_reply(cmd: str) -> bool:
+    """Check whether the server answers a command (texture ops and queries)."""
+    fields = cmd.split()
+    if not fields:
+        return False
+    if fields[0] == "tex" or fields[-1].endswith("?"):
+        return True
+    return fields[0] == "rect" and fields[-1] == "T"
+
+SOCKET_PATH = "/tmp/zxvdu.sock"  # used when the server runs with -cmdsock
+BUSY_ERROR = "ERROR 0033"  # sent for drawing commands dropped by a full queue
 
 class VDU:
     """Simple ZXVDU client implementation."""
     
     def __init__(self, host: str = "localhost", port: int = 55550):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.connect((host, port))
+        self.sock = None
+        # Prefer the Unix socket for a local server, falling back to TCP
+        if host in ("localhost", "127.0.0.1", "::1") and os.path.exists(SOCKET_PATH):
+            try:
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.connect(SOCKET_PATH)
+            except OSError:
+                self.sock.close()
+                self.sock = None
+        if self.sock is None:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.sock.connect((host, port))
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
+        self._rxbuf = bytearray()
         
     def send(self, cmd: str) -> str:
-        """Send a command and return the response."""
-        self.sock.send((cmd + "\n").encode())
-        return self.sock.recv(1024).decode().strip()
+        """Send a command and return the response, if the server sends one."""
+        self.sock.sendall((cmd + "\n").encode())
+        return self._readline() if _expects_reply(cmd) else ""
+        
+    def _readline(self) -> str:
+        """Return the next response line, reading only when none is buffered."""
+        while True:
+            while b"\n" not in self._rxbuf:
+                chunk = self.sock.recv(4096)
+                if not chunk:
+                    raise ConnectionError("Connection closed by ZXVDU server")
+                self._rxbuf += chunk
+            end = self._rxbuf.index(b"\n")
+            with memoryview(self._rxbuf) as view:
+                line = bytes(view[:end]).decode().strip()
+            del self._rxbuf[:end + 1]
+            # A busy error means a drawing command was dropped; it is not
+            # the reply to anything we are waiting for
+            if not line.startswith(BUSY_ERROR):
+                return line
+        
+    def send_batch(self, cmds: List[str]) -> List[str]:
+        """Send several commands in one write and return any responses."""
+        expected = sum(1 for cmd in cmds if _expects_reply(cmd))
+        self.sock.sendall(("\n".join(cmds) + "\n").encode())
+        return [self._readline() for _ in range(expected)]
         
     def close(self):
         """Close the connection."""
         self.sock.close()
 
+# Bounce easing constants: each bounce is the parabola n1 * (x - c)^2 + b,
+# with segment boundaries at 1, 2 and 2.5 divided by d1 = 2.75
+_BOUNCE_N1 = 7.5625
+_BOUNCE_T1 = 1 / 2.75
+_BOUNCE_T2 = 2 / 2.75
+_BOUNCE_T3 = 2.5 / 2.75
+_BOUNCE_C = (0.0, 1.5 / 2.75, 2.25 / 2.75, 2.625 / 2.75)
+_BOUNCE_B = (0.0, 0.75, 0.9375, 0.984375)
+
 def ease_out_bounce(x: float) -> float:
     """
     Bounce easing out function.
     Creates a bouncing effect that starts fast and then decelerates.
     """
-    n1 = 7.5625
-    d1 = 2.75
-
-    if x < 1 / d1:
-        return n1 * x * x
-    elif x < 2 / d1:
-        x -= 1.5 / d1
-        return n1 * x * x + 0.75
-    elif x < 2.5 / d1:
-        x -= 2.25 / d1
-        return n1 * x * x + 0.9375
-    else:
-        x -= 2.625 / d1
-        return n1 * x * x + 0.984375
+    i = 0 if x < _BOUNCE_T1 else 1 if x < _BOUNCE_T2 else 2 if x < _BOUNCE_T3 else 3
+    x -= _BOUNCE_C[i]
+    return _BOUNCE_N1 * x * x + _BOUNCE_B[i]
 
 def ease_in_out_quad(x: float) -> float:
     """
     Quadratic easing in/out function.
     Accelerates until halfway, then decelerates.
     """
-    return 2 * x * x if x < 0.5 else 1 - pow(-2 * x + 2, 2) / 2
-
-def interpolate(start: float, end: float, progress: float) -> float:
-    """Linear interpolation between start and end values."""
-    return start + (end - start) * progress
+    if x < 0.5:
+        return 2 * x * x
+    u = 2 - 2 * x
+    return 1 - u * u / 2
 
 class BouncingBall:
     def __init__(self, vdu: VDU, width: int = 256, height: int = 192):
@@ -73,19 +121,37 @@ class BouncingBall:
         # Ball properties
         self.radius = 10
         self.color = 2  # Red
+        self.paper = 0  # Black
         
         # Animation properties
         self.bounce_duration = 1.0  # seconds per bounce
         self.horizontal_duration = 2.0  # seconds to cross screen
         
-        # Initialize position tracking
-        self.start_time = time.time()
+        # Constants for calculate_position, hoisted out of the frame loop
+        self._inv_hd = 1.0 / self.horizontal_duration
+        self._inv_bd = 1.0 / self.bounce_duration
+        self._span_x = self.width - 2 * self.radius
+        self._span_y = -(self.height - 2 * self.radius)
+        self._base_y = self.height - self.radius
+        
+        # Positions repeat once both motions complete whole cycles, so they
+        # are memoized per millisecond of that period
+        horizontal_ms = int(round(2 * self.horizontal_duration * 1000))
+        bounce_ms = int(round(self.bounce_duration * 1000))
+        self._period_ms = horizontal_ms * bounce_ms // math.gcd(horizontal_ms, bounce_ms)
+        self._pos_cache = {}
+        
+        # Initialize position tracking. Buffer 1 is always the back buffer,
+        # so it still holds the ball drawn two frames ago; _drawn records
+        # [ball in back buffer, ball on screen] so only that area is erased.
+        self._start_ns = time.monotonic_ns()
+        self._drawn = [None, None]
         
     def setup(self):
         """Set up initial VDU state."""
-        # Set up double buffering - we'll use buffers 0 and 1
+        # Set up double buffering - we draw to buffer 1 and flip it with 0
         self.vdu.send("paint flip")  # Select flip buffer mode
-        self.vdu.send("paper 0")     # Black background
+        self.vdu.send(f"paper {self.paper}")  # Black background
         self.vdu.send("ink 2")       # Red foreground
         self.vdu.send("bright 1")    # Bright colors
         
@@ -95,32 +161,47 @@ class BouncingBall:
         self.vdu.send("paint 1")
         self.vdu.send("cls")
     
-    def calculate_position(self, current_time: float) -> Tuple[int, int]:
-        """Calculate the current ball position based on time."""
-        elapsed = current_time - self.start_time
-        
+    def calculate_position(self, current_ns: int) -> Tuple[int, int]:
+        """Calculate the current ball position from a monotonic_ns() timestamp."""
+        key = (current_ns - self._start_ns) // 1_000_000 % self._period_ms
+        position = self._pos_cache.get(key)
+        if position is None:
+            position = self._pos_cache[key] = self._position_at(key / 1000)
+        return position
+    
+    def _position_at(self, elapsed: float) -> Tuple[int, int]:
+        """Calculate the ball position a given number of seconds in."""
         # Horizontal movement (continuous back and forth)
-        horizontal_progress = (elapsed % self.horizontal_duration) / self.horizontal_duration
-        if int(elapsed / self.horizontal_duration) % 2:  # Reverse direction every cycle
-            horizontal_progress = 1 - horizontal_progress
+        cycles, remainder = divmod(elapsed, self.horizontal_duration)
+        horizontal_progress = remainder * self._inv_hd
+        if int(cycles) & 1:  # Reverse direction every cycle
+            horizontal_progress = 1.0 - horizontal_progress
         horizontal_progress = ease_in_out_quad(horizontal_progress)
-        x = interpolate(self.radius, self.width - self.radius, horizontal_progress)
+        x = self.radius + horizontal_progress * self._span_x
         
         # Vertical movement (bouncing)
-        bounce_progress = (elapsed % self.bounce_duration) / self.bounce_duration
+        bounce_progress = (elapsed % self.bounce_duration) * self._inv_bd
         bounce_progress = ease_out_bounce(bounce_progress)
-        y = interpolate(self.height - self.radius, self.radius, bounce_progress)
+        y = self._base_y + bounce_progress * self._span_y
         
         return int(x), int(y)
     
-    def draw_frame(self, buffer: int, x: int, y: int):
-        """Draw a single frame to the specified buffer."""
-        # Select buffer and clear it
-        self.vdu.send(f"paint {buffer}")
-        self.vdu.send("cls")
+    def draw_frame(self, x: int, y: int):
+        """Draw a single frame to the back buffer and flip it into view."""
+        cmds = ["paint 1"]
+        
+        # Erase the ball this buffer last held instead of clearing it all
+        stale = self._drawn[0]
+        if stale is not None:
+            r = self.radius
+            cmds.append(f"rect {stale[0] - r} {stale[1] - r} {2 * r + 1} {2 * r + 1} "
+                        f"{self.paper} F")
         
-        # Draw the ball
-        self.vdu.send(f"circle {x} {y} {self.radius} {self.color} F")
+        # Draw the ball and flip buffers
+        cmds.append(f"circle {x} {y} {self.radius} {self.color} F")
+        cmds.append("flip 1")
+        self.vdu.send_batch(cmds)
+        self._drawn = [self._drawn[1], (x, y)]
     
     def animate(self, duration: float = 10.0):
         """Run the animation for the specified duration."""
@@ -128,23 +209,30 @@ class BouncingBall:
             self.setup()
             
             # Animation loop
-            active_buffer = 0
-            end_time = time.time() + duration
+            end_ns = time.monotonic_ns() + int(duration * 1e9)
+            next_deadline = time.monotonic_ns() + FRAME_NS
             
-            while time.time() < end_time:
-                # Calculate new position
-                x, y = self.calculate_position(time.time())
+            while True:
+                now_ns = time.monotonic_ns()
+                if now_ns >= end_ns:
+                    break
                 
-                # Draw to back buffer
-                back_buffer = 1 - active_buffer
-                self.draw_frame(back_buffer, x, y)
+                # Calculate new position
+                x, y = self.calculate_position(now_ns)
                 
-                # Flip buffers
-                self.vdu.send(f"flip {back_buffer}")
-                active_buffer = back_buffer
+                # Draw to back buffer and flip it, unless the ball hasn't moved
+                if (x, y) != self._drawn[1]:
+                    self.draw_frame(x, y)
                 
-                # Control frame rate
-                time.sleep(1/60)  # Aim for 60 FPS
+                # Control frame rate (60 FPS): sleep until the next deadline,
+                # or skip the missed frames if we've fallen behind
+                now_ns = time.monotonic_ns()
+                sleep_ns = next_deadline - now_ns
+                if sleep_ns > 0:
+                    time.sleep(sleep_ns * 1e-9)
+                    next_deadline += FRAME_NS
+                else:
+                    next_deadline = now_ns + FRAME_NS
                 
         except KeyboardInterrupt:
             pass
@@ -13,11 +13,14 @@ from dataclasses import dataclass
 from typing import List, Optional, Tuple
 import random
 import keyboard
+import numpy as np
 
 # Add the lib directory to the path
 sys.path.append("../lib")
 from zxvdu import VDU, Color, BufferMode, DrawMode, Texture, VDUError
 
+FRAME_NS = 16_666_667  # 60 FPS
+
 @dataclass
 class GameObject:
     """Base class for game objects."""
@@ -27,48 +30,6 @@ class GameObject:
     height: int
     texture: Optional[Texture] = None
 
-    def intersects(self, other: 'GameObject') -> bool:
-        """Check if this object intersects with another."""
-        return (self.x < other.x + other.width and
-                self.x + self.width > other.x and
-                self.y < other.y + other.height and
-                self.y + self.height > other.y)
-
-class Invader(GameObject):
-    """Represents an alien invader."""
-    def __init__(self, x: float, y: float, textures: List[Texture]):
-        super().__init__(x, y, textures[0].width, textures[0].height)
-        self.textures = textures
-        self.current_frame = 0
-        self.frame_time = 0
-        self.frame_delay = 0.5  # seconds between frames
-        self.direction = 1  # 1 = right, -1 = left
-        self.speed = 30  # pixels per second
-        self.step_down = False
-        
-    def update(self, dt: float, bounds: Tuple[int, int]):
-        """Update invader position and animation."""
-        self.frame_time += dt
-        if self.frame_time >= self.frame_delay:
-            self.frame_time = 0
-            self.current_frame = (self.current_frame + 1) % len(self.textures)
-            
-        # Movement
-        if self.step_down:
-            self.y += 10
-            self.direction *= -1
-            self.step_down = False
-        else:
-            self.x += self.direction * self.speed * dt
-            
-        # Check bounds
-        if self.x <= bounds[0] or self.x + self.width >= bounds[1]:
-            self.step_down = True
-
-    def draw(self, vdu: VDU):
-        """Draw the invader using current animation frame."""
-        self.textures[self.current_frame].draw(int(self.x), int(self.y))
-
 class Player(GameObject):
     """Represents the player's ship."""
     def __init__(self, x: float, y: float, texture: Texture):
@@ -85,25 +46,9 @@ class Player(GameObject):
         if self.cooldown > 0:
             self.cooldown = max(0, self.cooldown - dt)
 
-    def draw(self, vdu: VDU):
-        """Draw the player's ship."""
-        self.texture.draw(int(self.x), int(self.y))
-
-class Projectile(GameObject):
-    """Represents a projectile (bullet)."""
-    def __init__(self, x: float, y: float, speed: float):
-        super().__init__(x, y, 2, 6)
-        self.speed = speed
-    
-    def update(self, dt: float) -> bool:
-        """Update projectile position. Returns True if still active."""
-        self.y += self.speed * dt
-        return 0 <= self.y <= 192
-    
-    def draw(self, vdu: VDU):
-        """Draw the projectile."""
-        vdu.rect(int(self.x), int(self.y), self.width, self.height, 
-                 Color.YELLOW, DrawMode.FILL)
+    def draw_cmd(self) -> str:
+        """Return the command that draws the player's ship."""
+        return self.texture.paint_cmd(int(self.x), int(self.y))
 
 class Game:
     """Main game class."""
@@ -118,15 +63,41 @@ class Game:
         self.invader_textures = self._create_invader_textures()
         self.player_texture = self._create_player_texture()
         
-        # Create game objects
+        # Invader properties, shared by the whole fleet
+        self.invader_width = self.invader_textures[0].width
+        self.invader_height = self.invader_textures[0].height
+        self.invader_speed = 30  # pixels per second
+        self.invader_frame_delay = 0.5  # seconds between frames
+        
+        # Projectile properties
+        self.projectile_width = 2
+        self.projectile_height = 6
+        self.projectile_speed = -150  # pixels per second
+        
+        # Create game objects. Invaders and projectiles are stored as
+        # parallel arrays (one entry per object) so they update together.
         self.player = Player(self.width/2, self.height-20, self.player_texture)
-        self.invaders = self._create_invaders()
-        self.projectiles: List[Projectile] = []
+        self._create_invaders()
+        self.projectile_x = np.empty(0, np.float32)
+        self.projectile_y = np.empty(0, np.float32)
+        
+        # Background stars, re-scattered every frame
+        self._rng = random.Random()
+        self._n_stars = 20
         
         # Game state
         self.move_dir = 0
         self.shooting = False
         
+        # Key state, kept current by keyboard hooks instead of polling
+        self._keys = {'left': False, 'right': False, 'space': False}
+        self._key_hooks = []
+        for key in self._keys:
+            self._key_hooks.append(keyboard.on_press_key(
+                key, lambda e, key=key: self._set_key(key, True)))
+            self._key_hooks.append(keyboard.on_release_key(
+                key, lambda e, key=key: self._set_key(key, False)))
+        
     def _create_invader_textures(self) -> List[Texture]:
         """Create alien invader animation frames."""
         textures = []
@@ -165,102 +136,165 @@ class Game:
         self.vdu.triangle(7, 0, 2, 4, 12, 4, mode=DrawMode.FILL)
         return self.vdu.rect(0, 0, 16, 12, mode=DrawMode.TEXTURE)
     
-    def _create_invaders(self) -> List[Invader]:
+    def _create_invaders(self):
         """Create initial set of invaders."""
-        invaders = []
-        for row in range(3):
-            for col in range(8):
-                x = 20 + col * 24
-                y = 20 + row * 20
-                invaders.append(Invader(x, y, self.invader_textures))
-        return invaders
+        cols, rows = np.meshgrid(np.arange(8), np.arange(3))
+        self.invader_x = (20 + cols.ravel() * 24).astype(np.float32)
+        self.invader_y = (20 + rows.ravel() * 20).astype(np.float32)
+        self.invader_alive = np.ones(self.invader_x.size, bool)
+        
+        # The fleet moves and animates as one
+        self.invader_dir = 1  # 1 = right, -1 = left
+        self._invader_cur = 0
+        self._invader_frame_time = 0.0
+
+    def _set_key(self, key: str, pressed: bool):
+        """Record a key state change reported by a keyboard hook."""
+        self._keys[key] = pressed
 
     def handle_input(self):
         """Process keyboard input."""
-        self.move_dir = 0
-        if keyboard.is_pressed('left'):
-            self.move_dir = -1
-        if keyboard.is_pressed('right'):
-            self.move_dir = 1
+        keys = self._keys
+        self.move_dir = int(keys['right']) - int(keys['left'])
             
-        if keyboard.is_pressed('space') and self.player.cooldown <= 0:
+        if keys['space'] and self.player.cooldown <= 0:
             self.player.cooldown = self.player.fire_rate
             # Create new projectile
             x = self.player.x + self.player.width/2 - 1
             y = self.player.y
-            self.projectiles.append(Projectile(x, y, -150))
+            self.projectile_x = np.append(self.projectile_x, np.float32(x))
+            self.projectile_y = np.append(self.projectile_y, np.float32(y))
 
     def update(self, dt: float):
         """Update game state."""
         # Update player
         self.player.update(dt, self.move_dir, (0, self.width))
         
-        # Update invaders
-        for invader in self.invaders:
-            invader.update(dt, (0, self.width))
+        # Update invader animation
+        self._invader_frame_time += dt
+        if self._invader_frame_time >= self.invader_frame_delay:
+            self._invader_frame_time = 0.0
+            self._invader_cur = (self._invader_cur + 1) % len(self.invader_textures)
+        
+        # Update invader movement: the whole fleet steps down and turns
+        # around as soon as any live invader reaches the edge it's heading for
+        self.invader_x += self.invader_dir * self.invader_speed * dt
+        live_x = self.invader_x[self.invader_alive]
+        if self.invader_dir > 0:
+            at_edge = (live_x + self.invader_width >= self.width).any()
+        else:
+            at_edge = (live_x <= 0).any()
+        if at_edge:
+            self.invader_y += 10
+            self.invader_dir = -self.invader_dir
             
-        # Update projectiles and check collisions
-        self.projectiles = [p for p in self.projectiles if p.update(dt)]
+        # Update projectiles, dropping those that left the screen
+        self.projectile_y += self.projectile_speed * dt
+        onscreen = (self.projectile_y >= 0) & (self.projectile_y <= self.height)
+        px = self.projectile_x[onscreen]
+        py = self.projectile_y[onscreen]
+        
+        # Check collisions: every projectile against every live invader at once
+        ix = self.invader_x[None, :]
+        iy = self.invader_y[None, :]
+        hit = ((px[:, None] < ix + self.invader_width) &
+               (px[:, None] + self.projectile_width > ix) &
+               (py[:, None] < iy + self.invader_height) &
+               (py[:, None] + self.projectile_height > iy) &
+               self.invader_alive[None, :])
         
-        # Check collisions
-        for projectile in self.projectiles[:]:
-            for invader in self.invaders[:]:
-                if projectile.intersects(invader):
-                    self.projectiles.remove(projectile)
-                    self.invaders.remove(invader)
-                    self.score += 100
-                    break
+        # Resolve hits in a single pass over the projectiles that hit
+        # anything: each destroys the first invader still alive in its row,
+        # and spent projectiles are then dropped with one mask
+        spent = np.zeros(px.size, bool)
+        for p in np.flatnonzero(hit.any(axis=1)):
+            targets = np.flatnonzero(hit[p] & self.invader_alive)
+            if targets.size:
+                self.invader_alive[targets[0]] = False
+                spent[p] = True
+                self.score += 100
+        self.projectile_x = px[~spent]
+        self.projectile_y = py[~spent]
         
         # Check game over conditions
-        if not self.invaders:
+        alive = self.invader_alive
+        if not alive.any():
             print(f"You win! Score: {self.score}")
             self.running = False
-        elif any(invader.y + invader.height >= self.player.y for invader in self.invaders):
+        elif (self.invader_y[alive] + self.invader_height >= self.player.y).any():
             print(f"Game Over! Score: {self.score}")
             self.running = False
 
     def draw(self):
-        """Draw current game state."""
+        """Draw current game state as a single batch of commands."""
         # Clear both buffers
-        self.vdu.select_buffer(BufferMode.FLIP)
-        self.vdu.clear()
-        self.vdu.select_buffer(BufferMode.LAYER)
-        self.vdu.clear()
+        cmds = [
+            f"paint {BufferMode.FLIP.value}",
+            "cls",
+            f"paint {BufferMode.LAYER.value}",
+            "cls",
+        ]
         
         # Draw background stars
-        self.vdu.select_buffer(BufferMode.FLIP)
-        self.vdu.set_color(Color.WHITE, True)
-        for _ in range(20):
-            x = random.randint(0, self.width-1)
-            y = random.randint(0, self.height-1)
-            self.vdu.plot(x, y)
+        cmds += [f"paint {BufferMode.FLIP.value}", f"ink {Color.WHITE}", "bright 1"]
+        # One 32-bit draw per star: high half for x, low half for y
+        getrandbits = self._rng.getrandbits
+        for _ in range(self._n_stars):
+            bits = getrandbits(32)
+            cmds.append(f"plot {(bits >> 16) % self.width} {(bits & 0xFFFF) % self.height}")
             
         # Draw game objects
-        self.vdu.select_buffer(BufferMode.LAYER)
-        self.player.draw(self.vdu)
-        for invader in self.invaders:
-            invader.draw(self.vdu)
-        for projectile in self.projectiles:
-            projectile.draw(self.vdu)
+        cmds.append(f"paint {BufferMode.LAYER.value}")
+        cmds.append(self.player.draw_cmd())
+        
+        # All invaders share one animation frame, so their commands are
+        # encoded together from the texture's bytes template
+        alive = self.invader_alive
+        texture = self.invader_textures[self._invader_cur]
+        invaders = texture.paint_many(zip(self.invader_x[alive].tolist(),
+                                          self.invader_y[alive].tolist()))
+        
+        projectiles = [
+            f"rect {int(x)} {int(y)} {self.projectile_width} "
+            f"{self.projectile_height} {Color.YELLOW} {DrawMode.FILL.value}"
+            for x, y in zip(self.projectile_x.tolist(), self.projectile_y.tolist())
+        ]
+        
+        # Send the whole frame in one write. Texture paints are answered by
+        # the server; those replies are checked before the next frame
+        # rather than waited on now.
+        self.vdu.send_encoded_nowait(self.vdu.encode_batch(cmds), invaders,
+                                     self.vdu.encode_batch(projectiles))
 
     def run(self):
         """Main game loop."""
-        last_time = time.time()
+        last_ns = time.monotonic_ns()
+        next_deadline = last_ns + FRAME_NS
         try:
             while self.running:
-                current_time = time.time()
-                dt = current_time - last_time
-                last_time = current_time
+                now_ns = time.monotonic_ns()
+                dt_ns = now_ns - last_ns
+                last_ns = now_ns
+                dt = dt_ns * 1e-9
                 
                 self.handle_input()
                 self.update(dt)
                 self.draw()
                 
-                # Control frame rate
-                time.sleep(max(0, 1/60 - dt))
+                # Control frame rate (60 FPS): sleep until the next deadline,
+                # or skip the missed frames if we've fallen behind
+                now_ns = time.monotonic_ns()
+                sleep_ns = next_deadline - now_ns
+                if sleep_ns > 0:
+                    time.sleep(sleep_ns * 1e-9)
+                    next_deadline += FRAME_NS
+                else:
+                    next_deadline = now_ns + FRAME_NS
                 
         finally:
             # Cleanup
+            for hook in self._key_hooks:
+                keyboard.unhook(hook)
             for texture in self.invader_textures:
                 texture.delete()
             self.player_texture.delete()
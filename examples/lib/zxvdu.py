@@ -7,13 +7,18 @@ This module provides a high-level interface for working with ZXVDU,
 including buffer management, texture handling, and drawing operations.
 """
 
+import os
 import socket
 import time
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import List, Tuple, Optional, Union
+from typing import Iterable, List, Tuple, Optional, Union
 import math
 
+# Unix socket the server listens on when started with -cmdsock
+DEFAULT_SOCKET_PATH = "/tmp/zxvdu.sock"
+_LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
 class VDUError(Exception):
     """Base exception for VDU errors."""
     pass
@@ -32,6 +37,40 @@ class DrawMode(Enum):
     STROKE = "S"
     TEXTURE = "T"
 
+def _expects_reply(cmd: str) -> bool:
+    """
+    Check whether the server answers a command with a response line.
+    Only texture operations, texture captures and queries are answered.
+    A plain drawing command produces a line only if it fails to parse, or
+    if the server is too busy to queue it; _readline() skips the latter.
+    """
+    fields = cmd.split()
+    if not fields:
+        return False
+    name = fields[0].lower()
+    if name == "tex" or fields[-1].endswith("?"):
+        return True
+    return name == "rect" and fields[-1].upper() == DrawMode.TEXTURE.value
+
+# Sent instead of queueing a plain drawing command when the server's queue
+# is full. It answers no command we wait on, so _readline() skips it.
+_BUSY_ERROR = "ERROR 0033"
+
+# Pre-encoded templates for drawing commands the server never answers.
+# Each has a variant with and without the optional colour parameter.
+_PLOT_FMT = b"plot %d %d\n"
+_PLOT_COLOR_FMT = b"plot %d %d %d\n"
+_LINE_FMT = b"line %d %d %d %d\n"
+_LINE_COLOR_FMT = b"line %d %d %d %d %d\n"
+_RECT_FMT = b"rect %d %d %d %d %b\n"
+_RECT_COLOR_FMT = b"rect %d %d %d %d %d %b\n"
+_CIRCLE_FMT = b"circle %d %d %d %b\n"
+_CIRCLE_COLOR_FMT = b"circle %d %d %d %d %b\n"
+_TRIANGLE_FMT = b"triangle %d %d %d %d %d %d %b\n"
+_TRIANGLE_COLOR_FMT = b"triangle %d %d %d %d %d %d %d %b\n"
+_TEX_PAINT_FMT = b"tex paint %d %d %d\n"
+_MODE_BYTES = {mode: mode.value.encode() for mode in DrawMode}
+
 class BufferMode(Enum):
     """Buffer selection modes."""
     FLIP = "flip"
@@ -65,11 +104,27 @@ class Texture:
         self.height = height
         self._valid = True
 
-    def draw(self, x: int, y: int):
-        """Draw the texture at the specified position."""
+    def paint_cmd(self, x: int, y: int) -> str:
+        """Return the command that draws the texture at the specified position."""
+        if not self._valid:
+            raise TextureError("Texture has been deleted")
+        return f"tex paint {x} {y} {self.slot}"
+
+    def paint_many(self, positions: Iterable[Tuple[int, int]]) -> Tuple[bytes, int]:
+        """
+        Encode commands that draw the texture at each position.
+        Returns the commands and the number of replies they produce, ready
+        for VDU.send_encoded_nowait().
+        """
         if not self._valid:
             raise TextureError("Texture has been deleted")
-        self.vdu._send(f"tex paint {x} {y} {self.slot}")
+        slot = self.slot
+        cmds = [_TEX_PAINT_FMT % (x, y, slot) for x, y in positions]
+        return b"".join(cmds), len(cmds)
+
+    def draw(self, x: int, y: int):
+        """Draw the texture at the specified position."""
+        self.vdu._send(self.paint_cmd(x, y))
 
     def delete(self):
         """Delete the texture, freeing its slot."""
@@ -87,24 +142,55 @@ class Texture:
 class VDU:
     """Main interface to ZXVDU server."""
     
-    def __init__(self, host: str = "localhost", port: int = 55550):
-        """Initialize connection to ZXVDU server."""
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            self.sock.connect((host, port))
-        except ConnectionRefusedError:
-            raise VDUError(f"Could not connect to ZXVDU server at {host}:{port}")
+    def __init__(self, host: str = "localhost", port: int = 55550,
+                 socket_path: Optional[str] = DEFAULT_SOCKET_PATH):
+        """
+        Initialize connection to ZXVDU server.
+        For a local server, the Unix socket at socket_path is tried first
+        and TCP is used if it isn't available.
+        """
+        self.sock = None
+        if (socket_path and host in _LOCAL_HOSTS and hasattr(socket, "AF_UNIX")
+                and os.path.exists(socket_path)):
+            self.sock = self._connect_unix(socket_path)
+        
+        if self.sock is None:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Commands are tiny request/response packets; don't let Nagle hold them back
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            try:
+                self.sock.connect((host, port))
+            except ConnectionRefusedError:
+                raise VDUError(f"Could not connect to ZXVDU server at {host}:{port}")
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
+        # Linux only, and only meaningful for TCP
+        self._quickack = (hasattr(socket, "TCP_QUICKACK") and
+                          self.sock.family == socket.AF_INET)
         
         # Initialize default state
         self.current_color = Color.WHITE
         self.current_mode = BufferMode.FLIP
         self.bright = False
+        self._rxbuf = bytearray()
+        self._pending_replies = 0
         
+    @staticmethod
+    def _connect_unix(path: str) -> Optional[socket.socket]:
+        """Connect to the server's Unix socket, or return None on failure."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+        except OSError:
+            sock.close()
+            return None
+        return sock
+
     def _send(self, cmd: str) -> str:
         """Send a command and return the response."""
         try:
-            self.sock.send((cmd + "\n").encode())
-            response = self.sock.recv(1024).decode().strip()
+            self._drain_pending()
+            self.sock.sendall((cmd + "\n").encode())
+            response = self._readline()
             
             if response.startswith("ERROR"):
                 raise CommandError(response)
@@ -113,6 +199,109 @@ class VDU:
         except socket.error as e:
             raise VDUError(f"Communication error: {e}")
 
+    def _send_nowait(self, cmd: str):
+        """
+        Send a command without waiting for a response.
+        If the server does answer it, the reply is collected later by
+        _drain_pending() before the next command whose response we need.
+        """
+        try:
+            self.sock.sendall((cmd + "\n").encode())
+        except socket.error as e:
+            raise VDUError(f"Communication error: {e}")
+        if _expects_reply(cmd):
+            self._pending_replies += 1
+
+    def _send_bytes(self, data: bytes):
+        """
+        Send a pre-encoded, newline-terminated command without waiting.
+        Only used for drawing commands the server never answers, so no
+        reply is left pending.
+        """
+        try:
+            self.sock.sendall(data)
+        except socket.error as e:
+            raise VDUError(f"Communication error: {e}")
+
+    def _drain_pending(self):
+        """Read and check responses owed to earlier unawaited commands."""
+        while self._pending_replies:
+            self._pending_replies -= 1
+            response = self._readline()
+            if response.startswith("ERROR"):
+                raise CommandError(response)
+
+    def _readline(self) -> str:
+        """
+        Return the next response line from the server.
+        Reads from the socket only when the buffer holds no complete line,
+        so replies that arrive coalesced in one packet are kept in order.
+        Server-busy errors for dropped drawing commands are skipped, as
+        no reply count includes them.
+        """
+        while True:
+            while b"\n" not in self._rxbuf:
+                chunk = self.sock.recv(4096)
+                if not chunk:
+                    raise VDUError("Connection closed by ZXVDU server")
+                self._rxbuf += chunk
+                if self._quickack:
+                    # ACK immediately rather than waiting for delayed ACK
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            
+            end = self._rxbuf.index(b"\n")
+            with memoryview(self._rxbuf) as view:
+                line = bytes(view[:end]).decode().strip()
+            del self._rxbuf[:end + 1]
+            if not line.startswith(_BUSY_ERROR):
+                return line
+
+    def send_batch(self, cmds: List[str]) -> List[str]:
+        """
+        Send several commands in a single write and return their responses.
+        Only commands the server answers contribute a response, so a batch
+        of plain drawing commands costs one write and no reads.
+        """
+        if not cmds:
+            return []
+        expected = sum(1 for cmd in cmds if _expects_reply(cmd))
+        try:
+            self._drain_pending()
+            self.sock.sendall(("\n".join(cmds) + "\n").encode())
+            responses = [self._readline() for _ in range(expected)]
+        except socket.error as e:
+            raise VDUError(f"Communication error: {e}")
+
+        for response in responses:
+            if response.startswith("ERROR"):
+                raise CommandError(response)
+        return responses
+
+    @staticmethod
+    def encode_batch(cmds: List[str]) -> Tuple[bytes, int]:
+        """
+        Encode commands for VDU.send_encoded_nowait().
+        Returns the commands and the number of replies they produce.
+        """
+        if not cmds:
+            return b"", 0
+        replies = sum(1 for cmd in cmds if _expects_reply(cmd))
+        return ("\n".join(cmds) + "\n").encode(), replies
+
+    def send_encoded_nowait(self, *batches: Tuple[bytes, int]):
+        """
+        Send encoded batches, in order, in a single write without waiting.
+        Each batch comes from encode_batch() or Texture.paint_many(); the
+        replies they produce are checked before the next awaited command.
+        """
+        data = b"".join(batch[0] for batch in batches)
+        try:
+            self._drain_pending()
+            self.sock.sendall(data)
+        except socket.error as e:
+            raise VDUError(f"Communication error: {e}")
+        self._pending_replies += sum(batch[1] for batch in batches)
+
     def close(self):
         """Close the connection to ZXVDU."""
         try:
@@ -123,33 +312,37 @@ class VDU:
     def select_buffer(self, mode: BufferMode, number: Optional[int] = None):
         """Select buffer mode and optionally a specific buffer."""
         self.current_mode = mode
-        self._send(f"paint {mode.value}")
+        self._send_nowait(f"paint {mode.value}")
         if number is not None:
             if mode == BufferMode.FLIP:
-                self._send(f"flip {number}")
+                self._send_nowait(f"flip {number}")
             else:
-                self._send(f"layer {number}")
+                self._send_nowait(f"layer {number}")
 
     def set_color(self, color: int, bright: bool = False):
         """Set the current drawing color."""
         self.current_color = color
         self.bright = bright
-        self._send(f"ink {color}")
-        self._send(f"bright {1 if bright else 0}")
+        self._send_nowait(f"ink {color}")
+        self._send_nowait(f"bright {1 if bright else 0}")
 
     def clear(self):
         """Clear the current buffer."""
-        self._send("cls")
+        self._send_nowait("cls")
 
     def plot(self, x: int, y: int, color: Optional[int] = None):
         """Plot a single pixel."""
-        color_str = f" {color}" if color is not None else ""
-        self._send(f"plot {x} {y}{color_str}")
+        if color is None:
+            self._send_bytes(_PLOT_FMT % (x, y))
+        else:
+            self._send_bytes(_PLOT_COLOR_FMT % (x, y, color))
 
     def line(self, x1: int, y1: int, x2: int, y2: int, color: Optional[int] = None):
         """Draw a line between two points."""
-        color_str = f" {color}" if color is not None else ""
-        self._send(f"line {x1} {y1} {x2} {y2}{color_str}")
+        if color is None:
+            self._send_bytes(_LINE_FMT % (x1, y1, x2, y2))
+        else:
+            self._send_bytes(_LINE_COLOR_FMT % (x1, y1, x2, y2, color))
 
     def rect(self, x: int, y: int, width: int, height: int, 
              color: Optional[int] = None, mode: DrawMode = DrawMode.FILL) -> Optional[Texture]:
@@ -157,28 +350,37 @@ class VDU:
         Draw or capture a rectangle.
         Returns a Texture object if mode is TEXTURE, None otherwise.
         """
-        color_str = f" {color}" if color is not None else ""
-        response = self._send(f"rect {x} {y} {width} {height}{color_str} {mode.value}")
-        
         if mode == DrawMode.TEXTURE:
+            color_str = f" {color}" if color is not None else ""
+            response = self._send(f"rect {x} {y} {width} {height}{color_str} {mode.value}")
             try:
                 slot = int(response)
                 return Texture(self, slot, width, height)
             except ValueError:
                 raise TextureError("Failed to capture texture")
+        
+        if color is None:
+            self._send_bytes(_RECT_FMT % (x, y, width, height, _MODE_BYTES[mode]))
+        else:
+            self._send_bytes(_RECT_COLOR_FMT % (x, y, width, height, color, _MODE_BYTES[mode]))
         return None
 
     def circle(self, x: int, y: int, radius: int, 
                color: Optional[int] = None, mode: DrawMode = DrawMode.FILL):
         """Draw a circle."""
-        color_str = f" {color}" if color is not None else ""
-        self._send(f"circle {x} {y} {radius}{color_str} {mode.value}")
+        if color is None:
+            self._send_bytes(_CIRCLE_FMT % (x, y, radius, _MODE_BYTES[mode]))
+        else:
+            self._send_bytes(_CIRCLE_COLOR_FMT % (x, y, radius, color, _MODE_BYTES[mode]))
 
     def triangle(self, x1: int, y1: int, x2: int, y2: int, x3: int, y3: int,
                 color: Optional[int] = None, mode: DrawMode = DrawMode.FILL):
         """Draw a triangle."""
-        color_str = f" {color}" if color is not None else ""
-        self._send(f"triangle {x1} {y1} {x2} {y2} {x3} {y3}{color_str} {mode.value}")
+        if color is None:
+            self._send_bytes(_TRIANGLE_FMT % (x1, y1, x2, y2, x3, y3, _MODE_BYTES[mode]))
+        else:
+            self._send_bytes(_TRIANGLE_COLOR_FMT % (x1, y1, x2, y2, x3, y3, color,
+                                                    _MODE_BYTES[mode]))
 
     def create_texture_from_data(self, data: str, width: int, height: int) -> Texture:
         """Create a texture from hex pixel data."""
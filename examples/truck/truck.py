@@ -14,21 +14,86 @@ Features demonstrated:
 """
 
 import math
+import os
 import socket
 import time
-from typing import Tuple
+from typing import List, Tuple
+
+def _expects_reply(cmd: str) -> bool:
+    """Check whether the server answers a command (texture ops and queries)."""
+    fields = cmd.split()
+    if not fields:
+        return False
+    if fields[0] == "tex" or fields[-1].endswith("?"):
+        return True
+    return fields[0] == "rect" and fields[-1] == "T"
+
+FRAME_NS = 33_333_333  # 30 FPS
+
+# Wheel geometry: spoke endpoints for each rotation frame, computed once
+WHEEL_FRAMES = 4
+WHEEL_CENTER = (10, 10)
+WHEEL_RADIUS = 8
+SPOKE_ENDPOINTS = tuple(
+    tuple(
+        (int(WHEEL_CENTER[0] + math.cos(angle) * WHEEL_RADIUS),
+         int(WHEEL_CENTER[1] + math.sin(angle) * WHEEL_RADIUS))
+        for angle in ((frame / WHEEL_FRAMES) * 2 * math.pi + spoke * math.pi / 2
+                      for spoke in range(4))
+    )
+    for frame in range(WHEEL_FRAMES)
+)
+
+SOCKET_PATH = "/tmp/zxvdu.sock"  # used when the server runs with -cmdsock
+BUSY_ERROR = "ERROR 0033"  # sent for drawing commands dropped by a full queue
 
 class VDU:
     """Simple ZXVDU client implementation."""
     
     def __init__(self, host: str = "localhost", port: int = 55550):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.connect((host, port))
+        self.sock = None
+        # Prefer the Unix socket for a local server, falling back to TCP
+        if host in ("localhost", "127.0.0.1", "::1") and os.path.exists(SOCKET_PATH):
+            try:
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.connect(SOCKET_PATH)
+            except OSError:
+                self.sock.close()
+                self.sock = None
+        if self.sock is None:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.sock.connect((host, port))
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
+        self._rxbuf = bytearray()
         
     def send(self, cmd: str) -> str:
-        """Send a command and return the response."""
-        self.sock.send((cmd + "\n").encode())
-        return self.sock.recv(1024).decode().strip()
+        """Send a command and return the response, if the server sends one."""
+        self.sock.sendall((cmd + "\n").encode())
+        return self._readline() if _expects_reply(cmd) else ""
+        
+    def _readline(self) -> str:
+        """Return the next response line, reading only when none is buffered."""
+        while True:
+            while b"\n" not in self._rxbuf:
+                chunk = self.sock.recv(4096)
+                if not chunk:
+                    raise ConnectionError("Connection closed by ZXVDU server")
+                self._rxbuf += chunk
+            end = self._rxbuf.index(b"\n")
+            with memoryview(self._rxbuf) as view:
+                line = bytes(view[:end]).decode().strip()
+            del self._rxbuf[:end + 1]
+            # A busy error means a drawing command was dropped; it is not
+            # the reply to anything we are waiting for
+            if not line.startswith(BUSY_ERROR):
+                return line
+        
+    def send_batch(self, cmds: List[str]) -> List[str]:
+        """Send several commands in one write and return any responses."""
+        expected = sum(1 for cmd in cmds if _expects_reply(cmd))
+        self.sock.sendall(("\n".join(cmds) + "\n").encode())
+        return [self._readline() for _ in range(expected)]
         
     def close(self):
         """Close the connection."""
@@ -42,10 +107,11 @@ class TruckAnimation:
         
         # Animation properties
         self.scroll_speed = 2  # pixels per frame
-        self.wheel_frames = 4  # number of wheel animation frames
+        self.wheel_frames = WHEEL_FRAMES  # number of wheel animation frames
         self.current_wheel = 0
         self.wheel_delay = 0.1  # seconds between wheel frames
-        self.last_wheel_update = 0
+        self._wheel_delay_ns = int(self.wheel_delay * 1e9)
+        self.last_wheel_update = 0  # monotonic_ns() of the last frame change
         
         # Background properties
         self.mountain_height = 40
@@ -58,36 +124,51 @@ class TruckAnimation:
         # Storage for texture slots
         self.wheel_textures = []
         self.truck_body_texture = None
+        self.truck_textures = []  # body and wheels composited, one per wheel frame
+        self.background_texture = None
+        self._draw_truck_cmds = []
         
-    def draw_mountain_background(self, buffer: int):
-        """Draw a simple mountain landscape."""
-        self.vdu.send(f"paint {buffer}")
-        self.vdu.send("cls")
+        # The landscape never changes, so its commands are built only once
+        self._bg_cmds = self._build_background_cmds()
+        
+    def _build_background_cmds(self) -> List[str]:
+        """Build the commands that draw a simple mountain landscape."""
+        horizon = self.height - self.ground_height
         
         # Sky
-        self.vdu.send("ink 1")  # Blue
-        self.vdu.send(f"rect 0 0 {self.width} {self.height - self.ground_height} _ F")
+        cmds = ["ink 1", f"rect 0 0 {self.width} {horizon} F"]  # Blue
         
         # Mountains
-        self.vdu.send("ink 4")  # Green
+        cmds.append("ink 4")  # Green
         points = [
-            (0, self.height - self.ground_height),
-            (50, self.height - self.ground_height - self.mountain_height),
-            (100, self.height - self.ground_height),
-            (150, self.height - self.ground_height - self.mountain_height * 0.7),
-            (200, self.height - self.ground_height),
-            (250, self.height - self.ground_height - self.mountain_height * 0.5),
-            (self.width, self.height - self.ground_height)
+            (0, horizon),
+            (50, horizon - self.mountain_height),
+            (100, horizon),
+            (150, horizon - int(self.mountain_height * 0.7)),
+            (200, horizon),
+            (250, horizon - int(self.mountain_height * 0.5)),
+            (self.width, horizon)
         ]
         
         for i in range(len(points) - 1):
             x1, y1 = points[i]
             x2, y2 = points[i + 1]
-            self.vdu.send(f"triangle {x1} {y1} {x2} {y2} {x2} {y1} _ F")
+            cmds.append(f"triangle {x1} {y1} {x2} {y2} {x2} {y1} F")
         
         # Ground
-        self.vdu.send("ink 6")  # Yellow
-        self.vdu.send(f"rect 0 {self.height - self.ground_height} {self.width} {self.ground_height} _ F")
+        cmds.append("ink 6")  # Yellow
+        cmds.append(f"rect 0 {horizon} {self.width} {self.ground_height} F")
+        return cmds
+        
+    def draw_mountain_background(self, buffer: int):
+        """Draw a simple mountain landscape."""
+        self.vdu.send_batch(["paint flip", f"paint {buffer}", "cls", *self._bg_cmds])
+    
+    def capture_background(self):
+        """Draw the landscape once and capture it as a texture."""
+        self.draw_mountain_background(1)
+        response = self.vdu.send(f"rect 0 0 {self.width} {self.height} T")
+        self.background_texture = int(response)
     
     def create_truck_textures(self):
         """Create textures for truck body and wheels."""
@@ -97,12 +178,12 @@ class TruckAnimation:
         
         # Main body (red)
         self.vdu.send("ink 2")
-        self.vdu.send(f"rect {self.truck_x} {self.truck_y} 60 20 _ F")
-        self.vdu.send(f"rect {self.truck_x + 40} {self.truck_y - 15} 20 15 _ F")
+        self.vdu.send(f"rect {self.truck_x} {self.truck_y} 60 20 F")
+        self.vdu.send(f"rect {self.truck_x + 40} {self.truck_y - 15} 20 15 F")
         
         # Windows (cyan)
         self.vdu.send("ink 5")
-        self.vdu.send(f"rect {self.truck_x + 42} {self.truck_y - 12} 15 8 _ F")
+        self.vdu.send(f"rect {self.truck_x + 42} {self.truck_y - 12} 15 8 F")
         
         # Capture truck body
         response = self.vdu.send(f"rect {self.truck_x} {self.truck_y - 15} 60 35 T")
@@ -116,51 +197,74 @@ class TruckAnimation:
             
             # Draw wheel with spokes at different angles
             self.vdu.send("ink 7")  # White
-            angle = (i / self.wheel_frames) * 2 * math.pi
-            cx, cy = 10, 10  # Center of wheel
-            radius = 8
+            cx, cy = WHEEL_CENTER
             
             # Wheel rim
-            self.vdu.send(f"circle {cx} {cy} {radius} _ S")
+            self.vdu.send(f"circle {cx} {cy} {WHEEL_RADIUS} S")
             
             # Spokes
-            for spoke in range(4):
-                spoke_angle = angle + (spoke * math.pi / 2)
-                x = cx + math.cos(spoke_angle) * radius
-                y = cy + math.sin(spoke_angle) * radius
-                self.vdu.send(f"line {cx} {cy} {int(x)} {int(y)} _")
+            for x, y in SPOKE_ENDPOINTS[i]:
+                self.vdu.send(f"line {cx} {cy} {x} {y} _")
             
             # Capture wheel frame
             response = self.vdu.send(f"rect 0 0 20 20 T")
             self.wheel_textures.append(int(response))
+        
+        # Composite the body and both wheels into one texture per wheel frame.
+        # This is done on a layer buffer, which clears to transparent, so the
+        # gaps around the wheels still show the landscape behind the truck.
+        for wheel_texture in self.wheel_textures:
+            responses = self.vdu.send_batch([
+                "paint layer",
+                "paint 1",
+                "cls",
+                f"tex paint 0 0 {self.truck_body_texture}",
+                f"tex paint 10 25 {wheel_texture}",
+                f"tex paint 40 25 {wheel_texture}",
+                "rect 0 0 60 45 T",
+            ])
+            self.truck_textures.append(int(responses[-1]))
+        
+        # The separate parts are no longer needed
+        for texture in self.wheel_textures + [self.truck_body_texture]:
+            self.vdu.send(f"tex del {texture}")
+        self.wheel_textures = []
+        self.truck_body_texture = None
+        
+        # Pre-format the truck commands for each wheel frame. Every composite
+        # has the same opaque footprint and is painted at the same spot, so
+        # each one fully covers the last and the layer never needs clearing
+        # between frames.
+        self._draw_truck_cmds = [
+            ["paint layer", f"tex paint {self.truck_x} {self.truck_y - 15} {texture}"]
+            for texture in self.truck_textures
+        ]
     
     def draw_background(self, offset: int):
         """Draw scrolling background in flip buffer."""
+        cmds = ["paint flip", "paint 0"]
         # Draw base background twice to allow scrolling
         for i in range(2):
             pos_x = (i * self.width) - offset
             if pos_x < self.width:
-                self.draw_mountain_background(0)
+                cmds.append(f"tex paint {pos_x} 0 {self.background_texture}")
+        self.vdu.send_batch(cmds)
     
     def draw_truck(self):
         """Draw truck with current wheel frame in layer buffer."""
-        self.vdu.send("paint layer")
-        self.vdu.send("cls")
-        
-        # Draw truck body
-        self.vdu.send(f"tex paint {self.truck_x} {self.truck_y - 15} {self.truck_body_texture}")
-        
-        # Draw wheels
-        wheel_texture = self.wheel_textures[self.current_wheel]
-        self.vdu.send(f"tex paint {self.truck_x + 10} {self.truck_y + 10} {wheel_texture}")
-        self.vdu.send(f"tex paint {self.truck_x + 40} {self.truck_y + 10} {wheel_texture}")
+        self.vdu.send_batch(self._draw_truck_cmds[self.current_wheel])
     
-    def update_wheel_frame(self):
-        """Update wheel animation frame if enough time has passed."""
-        current_time = time.time()
-        if current_time - self.last_wheel_update >= self.wheel_delay:
+    def update_wheel_frame(self) -> bool:
+        """
+        Update wheel animation frame if enough time has passed.
+        Returns True if the frame changed.
+        """
+        now_ns = time.monotonic_ns()
+        if now_ns - self.last_wheel_update >= self._wheel_delay_ns:
             self.current_wheel = (self.current_wheel + 1) % self.wheel_frames
-            self.last_wheel_update = current_time
+            self.last_wheel_update = now_ns
+            return True
+        return False
     
     def animate(self, duration: float = 10.0):
         """Run the animation for the specified duration."""
@@ -168,20 +272,31 @@ class TruckAnimation:
             # Initial setup
             offset = 0
             self.create_truck_textures()
+            self.capture_background()
+            self.vdu.send_batch(["paint layer", "paint 0", "cls"])
+            self.draw_truck()
             
             # Animation loop
-            start_time = time.time()
-            while time.time() - start_time < duration:
+            end_ns = time.monotonic_ns() + int(duration * 1e9)
+            next_deadline = time.monotonic_ns() + FRAME_NS
+            while time.monotonic_ns() < end_ns:
                 # Update background position
                 offset = (offset + self.scroll_speed) % self.width
                 self.draw_background(offset)
                 
-                # Update and draw truck
-                self.update_wheel_frame()
-                self.draw_truck()
+                # Update truck, redrawing it only when the wheels turn
+                if self.update_wheel_frame():
+                    self.draw_truck()
                 
-                # Control frame rate
-                time.sleep(1/30)  # Aim for 30 FPS
+                # Control frame rate (30 FPS): sleep until the next deadline,
+                # or skip the missed frames if we've fallen behind
+                now_ns = time.monotonic_ns()
+                sleep_ns = next_deadline - now_ns
+                if sleep_ns > 0:
+                    time.sleep(sleep_ns * 1e-9)
+                    next_deadline += FRAME_NS
+                else:
+                    next_deadline = now_ns + FRAME_NS
                 
         except KeyboardInterrupt:
             pass
@@ -193,10 +308,12 @@ class TruckAnimation:
             self.vdu.send("cls")
             
             # Clean up textures
-            for texture in self.wheel_textures:
+            for texture in self.truck_textures + self.wheel_textures:
                 self.vdu.send(f"tex del {texture}")
             if self.truck_body_texture is not None:
                 self.vdu.send(f"tex del {self.truck_body_texture}")
+            if self.background_texture is not None:
+                self.vdu.send(f"tex del {self.background_texture}")
 
 def main():
     # Create VDU connection
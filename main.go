@@ -55,6 +55,7 @@ func main() {
 	hostFlag := flag.String("host", "0.0.0.0", "Server host address to bind to")
 	cmdPortFlag := flag.String("cmdport", "55550", "Port for drawing command server")
 	eventPortFlag := flag.String("eventport", "55551", "Port for event server")
+	cmdSockFlag := flag.String("cmdsock", "", "Unix socket path for drawing commands (disabled if empty)")
 	graphicsFlag := flag.Int("graphics", 1, "Graphics resolution multiplier")
 	zoomFlag := flag.Int("zoom", 1, "Display zoom factor")
 	flag.Parse()
@@ -90,7 +91,10 @@ func main() {
 	buffers = NewBufferSystem(8, int32(internalW), int32(internalH))
 
 	// Start network servers
-	go startDrawingCommandServer(fmt.Sprintf("%s:%s", *hostFlag, *cmdPortFlag))
+	go startDrawingCommandServer("tcp", fmt.Sprintf("%s:%s", *hostFlag, *cmdPortFlag))
+	if *cmdSockFlag != "" {
+		go startDrawingCommandServer("unix", *cmdSockFlag)
+	}
 	go startEventServer(fmt.Sprintf("%s:%s", *hostFlag, *eventPortFlag))
 
 	// Main render loop
@@ -152,6 +156,7 @@ func main() {
 	}
 
 	// Cleanup
+	removeDrawingCommandSocket()
 	buffers.Cleanup()
 	rl.CloseWindow()
 }
\ No newline at end of file
@@ -4,6 +4,7 @@ import (
 	"bufio"
 	"fmt"
 	"net"
+	"os"
 	"strings"
 	"sync"
 )
@@ -17,14 +18,32 @@ var (
 	eventConnsMu sync.Mutex
 )
 
-// startDrawingCommandServer listens on a TCP port for drawing commands
-func startDrawingCommandServer(addr string) {
-	ln, err := net.Listen("tcp", addr)
+// Unix socket path the drawing command server is bound to, if any
+var (
+	cmdSockPath   string
+	cmdSockPathMu sync.Mutex
+)
+
+// startDrawingCommandServer listens for drawing commands on a TCP address
+// or, with network "unix", on a Unix domain socket path
+func startDrawingCommandServer(network, addr string) {
+	if network == "unix" {
+		if err := clearStaleSocket(addr); err != nil {
+			fmt.Println("Error starting drawing command server:", err)
+			return
+		}
+	}
+	ln, err := net.Listen(network, addr)
 	if err != nil {
 		fmt.Println("Error starting drawing command server:", err)
 		return
 	}
 	defer ln.Close()
+	if network == "unix" {
+		cmdSockPathMu.Lock()
+		cmdSockPath = addr
+		cmdSockPathMu.Unlock()
+	}
 	fmt.Println("Drawing command server listening on", addr)
 	
 	for {
@@ -37,6 +56,37 @@ func startDrawingCommandServer(addr string) {
 	}
 }
 
+// clearStaleSocket removes a socket file left behind by a previous run.
+// Anything that is not a socket, or a socket another server is still
+// accepting on, is left alone and reported as an error.
+func clearStaleSocket(path string) error {
+	fi, err := os.Lstat(path)
+	if os.IsNotExist(err) {
+		return nil
+	}
+	if err != nil {
+		return err
+	}
+	if fi.Mode()&os.ModeSocket == 0 {
+		return fmt.Errorf("%s exists and is not a socket", path)
+	}
+	if conn, err := net.Dial("unix", path); err == nil {
+		conn.Close()
+		return fmt.Errorf("%s is in use by another server", path)
+	}
+	return os.Remove(path)
+}
+
+// removeDrawingCommandSocket deletes the Unix socket file on shutdown
+func removeDrawingCommandSocket() {
+	cmdSockPathMu.Lock()
+	defer cmdSockPathMu.Unlock()
+	if cmdSockPath != "" {
+		os.Remove(cmdSockPath)
+		cmdSockPath = ""
+	}
+}
+
 // startEventServer listens for event connections on a TCP port
 func startEventServer(addr string) {
 	ln, err := net.Listen("tcp", addr)